@@ -1,431 +1,856 @@
+import json
+import multiprocessing
 import os
+import re
 import sqlite3
-import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing, contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Iterator, NamedTuple, Optional, List, Set, Tuple
+from pyglossary.entry import DataEntry
 from pyglossary.glossary_v2 import Glossary
 
 # Initialize plugins once
 Glossary.init()
 
+# Bumped whenever _migrate() gains a step (stored in PRAGMA user_version)
+SCHEMA_VERSION = 2
+
+# Secondary indexes on entries; dropped during bulk imports and rebuilt after
+ENTRY_INDEXES = {
+    "idx_word": "entries(word)",
+    "idx_dict_word": "entries(dictionary_id, word)",
+    # Prefix lookups in search() and get_suggestions()
+    "idx_dict_wordkey": "entries(dictionary_id, word_key)",
+}
+
+_ENTRY_INDEXES_SQL = " ".join(
+    f"CREATE INDEX IF NOT EXISTS {name} ON {target};"
+    for name, target in ENTRY_INDEXES.items()
+)
+
+_SCHEMA_SQL = """
+BEGIN;
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    source_path TEXT NOT NULL,
+    word_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_encrypted BOOLEAN DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dictionary_id INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    word_key TEXT,
+    FOREIGN KEY(dictionary_id) REFERENCES dictionaries(id) ON DELETE CASCADE
+);
+-- Search history table
+CREATE TABLE IF NOT EXISTS search_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query TEXT NOT NULL,
+    dictionary_id INTEGER,
+    searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(dictionary_id) REFERENCES dictionaries(id) ON DELETE SET NULL
+);
+-- Favorites/Bookmarks table
+CREATE TABLE IF NOT EXISTS favorites (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    dictionary_id INTEGER,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(dictionary_id) REFERENCES dictionaries(id) ON DELETE SET NULL
+);
+-- Source folder contents as of the last completed scan
+CREATE TABLE IF NOT EXISTS scan_state (
+    directory TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+COMMIT;
+"""
+
+# Rows per executemany() call when bulk-inserting entries
+INSERT_CHUNK_SIZE = 10_000
+# Recent search results kept per manager (see DictionaryManager.search)
+SEARCH_CACHE_SIZE = 128
+
+# Characters replaced with "_" when deriving a dictionary name from a file name
+_DICT_NAME_TRANS = str.maketrans({" ": "_", ".": "_", "-": "_"})
+
+# BGL header signatures checked by _is_encrypted_bgl
+_PLAIN_BGL_MAGIC = (b"\x00\x01", b"\x01\x00")
+# "BAB" anywhere, or a UTF-16 BOM within the first 4 bytes
+_COMMERCIAL_SIG_RE = re.compile(rb"BAB|\A.{0,2}(?:\xff\xfe|\xfe\xff)", re.DOTALL)
+_PERSIAN_SIG_RE = re.compile(rb"hFarsi|Aryanpur|BGL|\x1f\x8b")
+
+# Persian spelling variants folded into one search key: zero-width (non-)joiners
+# and tatweel are dropped, Arabic yeh/kaf map to their Persian forms
+_PERSIAN_FOLD_TRANS = str.maketrans(
+    {
+        "\u200c": None,  # ZERO WIDTH NON-JOINER
+        "\u200d": None,  # ZERO WIDTH JOINER
+        "\u0640": None,  # ARABIC TATWEEL
+        "\u064a": "\u06cc",  # ARABIC YEH -> FARSI YEH
+        "\u0649": "\u06cc",  # ALEF MAKSURA -> FARSI YEH
+        "\u0643": "\u06a9",  # ARABIC KAF -> KEHEH
+    }
+)
+
+# Keystroke-hot queries, kept as constants so the connection's statement
+# cache reuses the prepared statements. Both range-scan idx_dict_wordkey.
+_SQL_SEARCH = """
+    SELECT id, word, definition
+    FROM entries
+    WHERE dictionary_id = ? AND word_key >= ? AND word_key < ?
+    ORDER BY word_key
+    LIMIT ?
+"""
+_SQL_SUGGEST = """
+    SELECT DISTINCT word
+    FROM entries
+    WHERE dictionary_id = ? AND word_key >= ? AND word_key < ?
+    ORDER BY word_key
+    LIMIT ?
+"""
+
+
+def _fold_word(word: str) -> str:
+    """Return the search key stored in entries.word_key.
+
+    Case is folded and combining marks (Latin accents, Arabic-script harakat)
+    are stripped, so queries typed without them still match. Persian text is
+    further normalized with _PERSIAN_FOLD_TRANS.
+    """
+    decomposed = unicodedata.normalize("NFKD", word).translate(_PERSIAN_FOLD_TRANS)
+    return "".join(
+        c for c in decomposed if not unicodedata.combining(c)
+    ).casefold()
+
+
+def _key_prefix_range(text: str) -> Tuple[str, str]:
+    """Return the [low, high) bounds of word_key values starting with `text`.
+
+    A plain range comparison is used rather than LIKE, which SQLite only
+    optimizes for case-insensitive indexes. `low` is empty when the text
+    folds away entirely (e.g. a lone ZWNJ or harakat); callers must not
+    search then, as the range would match every entry.
+    """
+    low = _fold_word(text.strip())
+    return low, low + "\U0010ffff"
+
+
+def _path_key(path: str) -> str:
+    """Canonical form of a file path for comparing stored source paths.
+
+    Resolves symlinks and relative parts, and folds case where the platform's
+    paths are case-insensitive (os.path.normcase).
+    """
+    return os.path.normcase(os.path.realpath(path))
+
+
+def _open_bgl(bgl_path: str) -> Tuple[Optional[Glossary], str]:
+    """Open a BGL file for reading. Returns (glossary, "") or (None, error message)."""
+    glos = Glossary()
+
+    # Use directRead for glossary_v2 API
+    try:
+        glos.directRead(bgl_path, formatName="BabylonBgl")
+    except Exception as e:
+        err = str(e).lower()
+        if any(k in err for k in ["encrypt", "password", "drm", "protected"]):
+            return None, (
+                "🔒 DECRYPTION FAILED\n\n"
+                "This is a commercial encrypted Babylon dictionary.\n"
+                "No legal tool can decrypt these files.\n\n"
+                "✅ Get FREE Persian dictionaries:\n"
+                "   https://github.com/kiomarszadeh/Persian-Dictionary"
+            )
+        return None, f"BGL parsing error: {str(e)}"
+    return glos, ""
+
+
+def _iter_bgl_entries(
+    glos: Glossary, counts: List[int]
+) -> Iterator[Tuple[str, str, str]]:
+    """Yield cleaned (word, word_key, definition) rows from an open glossary.
+
+    counts[0] is incremented for every entry read, counts[1] for every entry
+    that survives cleaning.
+    """
+    for entry in glos:
+        # Resource files (images, sounds) come through as DataEntry; a class
+        # identity check avoids a Python-level isData() call per entry
+        if type(entry) is DataEntry:
+            continue
+        word = entry.s_word
+        defi = entry.defi
+        if not (word and defi):
+            continue
+        counts[0] += 1
+        # Clean entries (handle encoding issues common in Persian text);
+        # pyglossary yields str, raw bytes only from misbehaving readers
+        if isinstance(word, (bytes, bytearray)):
+            word = word.decode("utf-8", "replace")
+        if isinstance(defi, (bytes, bytearray)):
+            defi = defi.decode("utf-8", "replace")
+        w = word.strip()
+        d = defi.strip()
+        if w and d:
+            counts[1] += 1
+            yield w, _fold_word(w), d
+
+
+def _parse_bgl(
+    bgl_path: str,
+) -> Tuple[Optional[str], List[Tuple[str, str, str]], List[int]]:
+    """Parse a whole BGL file in a worker process (see scan_and_import).
+
+    Returns (error, rows, counts) as produced by _iter_bgl_entries.
+    """
+    glos, error = _open_bgl(bgl_path)
+    if glos is None:
+        return error, [], [0, 0]
+
+    counts = [0, 0]
+    try:
+        return None, list(_iter_bgl_entries(glos, counts)), counts
+    except Exception as e:
+        return f"Error reading entries: {str(e)}", [], counts
+    finally:
+        glos.cleanup()
+
+
+class ScanResult(NamedTuple):
+    """Outcome for one file (or the whole folder) of scan_and_import."""
+
+    file: Optional[str]
+    status: str  # "success", "skip", "error" or "info"
+    message: str
+
 
 class DictionaryManager:
     def __init__(self, db_path: str = "dictionaries.db"):
         self.db_path = db_path
         self.current_dict_id: Optional[int] = None
+        # Ids from the last get_dictionaries() call; None after an import
+        self._dict_ids: Optional[Set[int]] = None
+        # (dictionary_id, folded query, limit) -> rows, least recently used first
+        self._search_cache: OrderedDict = OrderedDict()
+        # One long-lived autocommit connection shared by the worker threads;
+        # bulk imports open their own connection (see import_bgl)
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        self._lock = threading.Lock()
         self._init_db()
 
+    @contextmanager
+    def _shared_conn(self) -> Iterator[sqlite3.Connection]:
+        """Yield the shared connection while holding its lock"""
+        with self._lock:
+            yield self._conn
+
     def _init_db(self):
         """Initialize DB with schema migration support"""
-        with sqlite3.connect(self.db_path) as conn:
-            # Create tables if they don't exist
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS dictionaries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    source_path TEXT NOT NULL,
-                    word_count INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    dictionary_id INTEGER NOT NULL,
-                    word TEXT NOT NULL,
-                    definition TEXT NOT NULL,
-                    FOREIGN KEY(dictionary_id) REFERENCES dictionaries(id) ON DELETE CASCADE
-                )
-            """)
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_word ON entries(word)")
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_dict_word ON entries(dictionary_id, word)"
-            )
-
-            # Search history table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS search_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    query TEXT NOT NULL,
-                    dictionary_id INTEGER,
-                    searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(dictionary_id) REFERENCES dictionaries(id) ON DELETE SET NULL
-                )
+        with self._shared_conn() as conn:
+            # Larger pages give shallower B-trees on big dictionaries; the page
+            # size can only be chosen before the first table is created
+            if not conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+                conn.execute("PRAGMA page_size=65536")
+
+            # WAL lets searches read while an import is writing
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Read-heavy lookups: map the file and keep a 64 MB page cache
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+
+            # Create tables if they don't exist (one transaction, one commit)
+            conn.executescript(_SCHEMA_SQL)
+
+            # Migrations only run when the stored schema version is behind
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                with conn:
+                    conn.execute("BEGIN")
+                    self._migrate(conn, version)
+
+            conn.executescript(f"""
+                BEGIN;
+                {_ENTRY_INDEXES_SQL}
+                -- One favorite per (word, dictionary)
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_fav_unique
+                    ON favorites(word, dictionary_id);
+                COMMIT;
             """)
 
-            # Favorites/Bookmarks table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS favorites (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word TEXT NOT NULL,
-                    definition TEXT NOT NULL,
-                    dictionary_id INTEGER,
-                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(dictionary_id) REFERENCES dictionaries(id) ON DELETE SET NULL
-                )
-            """)
+    def _migrate(self, conn: sqlite3.Connection, version: int) -> None:
+        """Upgrade a database from schema `version` to SCHEMA_VERSION"""
+        if version < 1:
+            # Databases from before versioning: each step tolerates a schema
+            # that already has the change (including freshly created ones)
 
-            # Schema migration: add is_encrypted column if missing
+            # Add is_encrypted column if missing
             try:
                 conn.execute(
                     "ALTER TABLE dictionaries ADD COLUMN is_encrypted BOOLEAN DEFAULT 0"
                 )
-                conn.commit()
             except sqlite3.OperationalError:
                 # Column already exists
                 pass
 
+            # Add word_key column (folded search key) if missing
+            try:
+                conn.execute("ALTER TABLE entries ADD COLUMN word_key TEXT")
+            except sqlite3.OperationalError:
+                # Column already exists
+                pass
+            else:
+                # Filled in by the version 2 step below; word_key supersedes
+                # the FTS5 and LOWER(word) search indexes
+                conn.execute("DROP TRIGGER IF EXISTS entries_fts_ai")
+                conn.execute("DROP TRIGGER IF EXISTS entries_fts_ad")
+                conn.execute("DROP TABLE IF EXISTS entries_fts")
+                conn.execute("DROP INDEX IF EXISTS idx_dict_lword")
+
+            # Favorites were only de-duplicated in add_to_favorites; drop any
+            # duplicates before idx_fav_unique is created
+            conn.execute("""
+                DELETE FROM favorites WHERE id NOT IN (
+                    SELECT MIN(id) FROM favorites GROUP BY word, dictionary_id
+                )
+            """)
+
+        if version < 2:
+            # _fold_word gained Persian normalization: recompute stored keys
+            conn.create_function("fold_word", 1, _fold_word, deterministic=True)
+            conn.execute("UPDATE entries SET word_key = fold_word(word)")
+
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _create_entry_indexes(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(f"BEGIN; {_ENTRY_INDEXES_SQL} COMMIT;")
+
+    def _drop_entry_indexes(self, conn: sqlite3.Connection) -> None:
+        for name in ENTRY_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def _apply_bulk_pragmas(self, conn: sqlite3.Connection) -> None:
+        """Tune a connection for bulk inserts (fewer fsyncs, bigger page cache)"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        # Entries are staged in a TEMP table (see _store_entries); keep it on
+        # disk so a large dictionary is not held in RAM
+        conn.execute("PRAGMA temp_store=FILE")
+        conn.execute("PRAGMA cache_size=-200000")
+
     def _is_encrypted_bgl(self, file_path: str) -> Tuple[bool, str]:
         """Detect if BGL file is encrypted (common with Persian commercial dictionaries)"""
         try:
-            with open(file_path, "rb") as f:
+            # Unbuffered read: only 32 bytes are needed
+            with open(file_path, "rb", buffering=0) as f:
                 header = f.read(32)
-
-                # Unencrypted BGL typically starts with 0x00 0x01 or 0x01 0x00
-                if header.startswith(b"\x00\x01") or header.startswith(b"\x01\x00"):
-                    return False, "Unencrypted BGL detected"
-
-                # Common encryption signatures in commercial Babylon dictionaries
-                if (
-                    b"BAB" in header
-                    or b"\xff\xfe" in header[:4]
-                    or b"\xfe\xff" in header[:4]
-                ):
-                    return (
-                        True,
-                        "ENCRYPTED: Commercial Babylon dictionary (DRM protected)",
-                    )
-
-                # Persian commercial dictionaries often have these patterns
-                if any(
-                    sig in header
-                    for sig in [b"hFarsi", b"Aryanpur", b"BGL", b"\x1f\x8b"]
-                ):
-                    # Heuristic: if it has dictionary name but not standard BGL header → likely encrypted
-                    if not (
-                        header.startswith(b"\x00\x01") or header.startswith(b"\x01\x00")
-                    ):
-                        return (
-                            True,
-                            "LIKELY ENCRYPTED: Persian commercial dictionary (Aryanpur/hFarsi)",
-                        )
-
-                return False, "Unknown format - may be unencrypted"
         except Exception as e:
             return False, f"Error checking header: {str(e)}"
 
+        # Unencrypted BGL typically starts with 0x00 0x01 or 0x01 0x00
+        if header[:2] in _PLAIN_BGL_MAGIC:
+            return False, "Unencrypted BGL detected"
+
+        # Common encryption signatures in commercial Babylon dictionaries
+        if _COMMERCIAL_SIG_RE.search(header):
+            return True, "ENCRYPTED: Commercial Babylon dictionary (DRM protected)"
+
+        # Persian commercial dictionaries often have these patterns; the header
+        # is already known not to be a standard BGL header → likely encrypted
+        if _PERSIAN_SIG_RE.search(header):
+            return (
+                True,
+                "LIKELY ENCRYPTED: Persian commercial dictionary (Aryanpur/hFarsi)",
+            )
+
+        return False, "Unknown format - may be unencrypted"
+
     def import_bgl(self, bgl_path: str) -> Tuple[bool, str]:
         """Import BGL file with encryption detection and explicit format handling"""
         try:
-            bgl_path = os.path.abspath(bgl_path)
-            if not os.path.exists(bgl_path):
-                return False, f"File not found: {bgl_path}"
-
-            if not bgl_path.lower().endswith(".bgl"):
-                return False, "File must have .bgl extension (case-insensitive check)"
-
-            # Pre-check for encryption (saves time on failed imports)
-            is_encrypted, hint = self._is_encrypted_bgl(bgl_path)
-            if is_encrypted:
-                return False, (
-                    "🔒 ENCRYPTION DETECTED\n\n"
-                    f"File appears to be a commercial encrypted dictionary ({hint}).\n\n"
-                    "⚠️  Babylon's Persian dictionaries (Aryanpur Pro, hFarsi Advanced) use proprietary DRM\n"
-                    "that cannot be legally decrypted by third-party tools.\n\n"
-                    "✅ WORKING ALTERNATIVES:\n"
-                    "   • Use FREE unencrypted dictionaries from: https://github.com/ilius/pyglossary/wiki/BGL\n"
-                    "   • Convert StarDict format (.dict.dz + .idx) using pyglossary\n"
-                    "   • Export definitions via Babylon's official software first"
+            error, bgl_path, dict_name = self._prepare_bgl(bgl_path)
+            if error:
+                return False, error
+
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                self._apply_bulk_pragmas(conn)
+                return self._import_streaming(
+                    conn, bgl_path, dict_name, activate=True
                 )
 
-            dict_name = (
-                Path(bgl_path)
-                .stem.replace(" ", "_")
-                .replace(".", "_")
-                .replace("-", "_")
-            )
-
-            # Normalize extension to lowercase for pyglossary compatibility
-            if bgl_path != bgl_path.lower():
-                normalized_path = str(Path(bgl_path).with_suffix(".bgl").resolve())
-                if not os.path.exists(normalized_path):
-                    # Create lowercase symlink/copy for compatibility
-                    try:
-                        import shutil
-
-                        shutil.copy2(bgl_path, normalized_path)
-                        bgl_path = normalized_path
-                    except:
-                        pass  # Proceed with original path
+        except Exception as e:
+            return False, f"Import failed: {type(e).__name__}: {str(e)}"
 
-            with tempfile.TemporaryDirectory() as tmpdir:
-                glos = Glossary()
+    def _prepare_bgl(self, bgl_path: str) -> Tuple[Optional[str], str, str]:
+        """Validate a BGL file before parsing. Returns (error, abs_path, dict_name)."""
+        bgl_path = os.path.abspath(bgl_path)
+        if not os.path.exists(bgl_path):
+            return f"File not found: {bgl_path}", bgl_path, ""
+
+        if not bgl_path.lower().endswith(".bgl"):
+            return (
+                "File must have .bgl extension (case-insensitive check)",
+                bgl_path,
+                "",
+            )
 
-                # Use directRead for glossary_v2 API
-                try:
-                    glos.directRead(bgl_path, formatName="BabylonBgl")
-                except Exception as e:
-                    err = str(e).lower()
-                    if any(
-                        k in err for k in ["encrypt", "password", "drm", "protected"]
-                    ):
-                        return False, (
-                            "🔒 DECRYPTION FAILED\n\n"
-                            "This is a commercial encrypted Babylon dictionary.\n"
-                            "No legal tool can decrypt these files.\n\n"
-                            "✅ Get FREE Persian dictionaries:\n"
-                            "   https://github.com/kiomarszadeh/Persian-Dictionary"
+        # Pre-check for encryption (saves time on failed imports)
+        is_encrypted, hint = self._is_encrypted_bgl(bgl_path)
+        if is_encrypted:
+            return (
+                "🔒 ENCRYPTION DETECTED\n\n"
+                f"File appears to be a commercial encrypted dictionary ({hint}).\n\n"
+                "⚠️  Babylon's Persian dictionaries (Aryanpur Pro, hFarsi Advanced) use proprietary DRM\n"
+                "that cannot be legally decrypted by third-party tools.\n\n"
+                "✅ WORKING ALTERNATIVES:\n"
+                "   • Use FREE unencrypted dictionaries from: https://github.com/ilius/pyglossary/wiki/BGL\n"
+                "   • Convert StarDict format (.dict.dz + .idx) using pyglossary\n"
+                "   • Export definitions via Babylon's official software first"
+            ), bgl_path, ""
+
+        dict_name = Path(bgl_path).stem.translate(_DICT_NAME_TRANS)
+
+        return None, bgl_path, dict_name
+
+    def _import_streaming(
+        self,
+        conn: sqlite3.Connection,
+        bgl_path: str,
+        dict_name: str,
+        activate: bool = False,
+    ) -> Tuple[bool, str]:
+        """Parse a BGL file and stream its entries straight into the DB"""
+        glos, error = _open_bgl(bgl_path)
+        if glos is None:
+            return False, error
+
+        counts = [0, 0]
+        try:
+            return self._store_entries(
+                conn,
+                dict_name,
+                bgl_path,
+                _iter_bgl_entries(glos, counts),
+                counts,
+                activate,
+            )
+        finally:
+            glos.cleanup()
+
+    def _store_entries(
+        self,
+        conn: sqlite3.Connection,
+        dict_name: str,
+        bgl_path: str,
+        entries: Iterator[Tuple[str, str, str]],
+        counts: List[int],
+        activate: bool = False,
+    ) -> Tuple[bool, str]:
+        """Write a dictionary and its (word, word_key, definition) rows.
+
+        `counts` is [raw entries, entries kept after cleaning] and must be
+        final once `entries` is exhausted (see _iter_bgl_entries). With
+        `activate` the imported dictionary becomes the active one; background
+        scans leave the user's choice alone.
+
+        Rows are first staged in a TEMP table, which takes no lock on the
+        main database, so a slow BGL parse driving `entries` never blocks
+        other writers. Only the final swap into `entries` is one short
+        write transaction. The cost is writing every row twice; the staging
+        table lives in a temporary file (temp_store=FILE, set by
+        _apply_bulk_pragmas), not in memory.
+        """
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS staged_entries "
+            "(word TEXT, word_key TEXT, definition TEXT)"
+        )
+        try:
+            try:
+                with conn:
+                    while chunk := list(islice(entries, INSERT_CHUNK_SIZE)):
+                        conn.executemany(
+                            "INSERT INTO temp.staged_entries VALUES (?, ?, ?)", chunk
                         )
-                    return False, f"BGL parsing error: {str(e)}"
-
-                # Collect entries by iterating over the glossary
-                entries = []
-                try:
-                    for entry in glos:
-                        if entry.isData():
-                            continue
-                        word = entry.s_word
-                        defi = entry.defi
-                        if word and defi:
-                            entries.append((word, defi))
-                except Exception as e:
-                    glos.cleanup()
-                    return False, f"Error reading entries: {str(e)}"
-
-                glos.cleanup()
-
-                if not entries:
-                    return (
-                        False,
-                        "Dictionary contains no entries (likely encrypted or corrupted)",
-                    )
-
-                # Clean entries (handle encoding issues common in Persian text)
-                cleaned = []
-                for word, defi in entries:
-                    try:
-                        w = str(word).strip()
-                        d = str(defi).strip()
-                        if w and d:
-                            cleaned.append((w, d))
-                    except:
-                        continue
-
-                if not cleaned:
-                    return (
-                        False,
-                        "No valid entries after cleaning (encoding issues)",
-                    )
-
-                # Import into main DB
-                with sqlite3.connect(self.db_path) as conn:
-                    # Store dictionary metadata
-                    conn.execute(
-                        """INSERT OR REPLACE INTO dictionaries 
-                           (name, source_path, word_count, is_encrypted) 
-                           VALUES (?, ?, ?, 0)""",
-                        (dict_name, bgl_path, len(cleaned)),
-                    )
-                    dict_id = conn.execute(
-                        "SELECT id FROM dictionaries WHERE name = ?", (dict_name,)
-                    ).fetchone()[0]
-
-                    # Store entries
-                    conn.execute(
-                        "DELETE FROM entries WHERE dictionary_id = ?", (dict_id,)
-                    )
-                    conn.executemany(
-                        "INSERT INTO entries (dictionary_id, word, definition) VALUES (?, ?, ?)",
-                        [(dict_id, w, d) for w, d in cleaned],
-                    )
-                    conn.commit()
-                    self.current_dict_id = dict_id
-                    return (
-                        True,
-                        f"✅ Imported {len(cleaned):,} entries from '{dict_name}'",
-                    )
+            except sqlite3.Error:
+                raise
+            except Exception as e:
+                return False, f"Error reading entries: {str(e)}"
+
+            if not counts[0]:
+                return (
+                    False,
+                    "Dictionary contains no entries (likely encrypted or corrupted)",
+                )
+            if not counts[1]:
+                return False, "No valid entries after cleaning (encoding issues)"
+
+            with conn:
+                conn.execute("BEGIN")
+                # Store dictionary metadata
+                # (UPSERT keeps the existing id when re-importing)
+                dict_id = conn.execute(
+                    """INSERT INTO dictionaries
+                       (name, source_path, word_count, is_encrypted)
+                       VALUES (?, ?, ?, 0)
+                       ON CONFLICT(name) DO UPDATE SET
+                           source_path = excluded.source_path,
+                           word_count = excluded.word_count,
+                           is_encrypted = excluded.is_encrypted
+                       RETURNING id""",
+                    (dict_name, bgl_path, counts[1]),
+                ).fetchone()[0]
+
+                # Replace the dictionary's entries with the staged rows
+                conn.execute("DELETE FROM entries WHERE dictionary_id = ?", (dict_id,))
+                conn.execute(
+                    """INSERT INTO entries (dictionary_id, word, word_key, definition)
+                       SELECT ?, word, word_key, definition FROM temp.staged_entries""",
+                    (dict_id,),
+                )
+        finally:
+            conn.execute("DELETE FROM temp.staged_entries")
+            conn.commit()
 
-        except Exception as e:
-            return False, f"Import failed: {type(e).__name__}: {str(e)}"
+        self._dict_ids = None
+        with self._lock:
+            self._search_cache.clear()
+        if activate:
+            self.current_dict_id = dict_id
+        return True, f"✅ Imported {counts[1]:,} entries from '{dict_name}'"
 
-    def search(self, query: str, limit: int = 20) -> List[Tuple[str, str]]:
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, str, str]]:
+        """Entries whose headword starts with `query`, as (entry id, word, definition)."""
         if not self.current_dict_id or not query.strip():
             return []
 
-        query = query.strip().lower()
-        with sqlite3.connect(self.db_path) as conn:
+        low, high = _key_prefix_range(query)
+        if not low:
+            return []
+        # Folded key, so "Hello" and "hello" share an entry
+        key = (self.current_dict_id, low, limit)
+        with self._shared_conn() as conn:
+            results = self._search_cache.get(key)
+            if results is not None:
+                self._search_cache.move_to_end(key)
+                return results
             results = conn.execute(
-                """
-                SELECT word, definition 
-                FROM entries 
-                WHERE dictionary_id = ? AND LOWER(word) LIKE ?
-                ORDER BY word
-                LIMIT ?
-            """,
-                (self.current_dict_id, f"{query}%", limit),
+                _SQL_SEARCH, (self.current_dict_id, low, high, limit)
             ).fetchall()
+            self._search_cache[key] = results
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
             return results
 
+    def get_definition(self, entry_id: int) -> Optional[str]:
+        """Definition of one entry (by id) of the active dictionary.
+
+        By id rather than headword: a dictionary may hold several entries
+        with the same word.
+        """
+        if not self.current_dict_id:
+            return None
+        with self._shared_conn() as conn:
+            row = conn.execute(
+                "SELECT definition FROM entries WHERE id = ? AND dictionary_id = ?",
+                (entry_id, self.current_dict_id),
+            ).fetchone()
+        return row[0] if row else None
+
     def get_suggestions(self, prefix: str, limit: int = 10) -> List[str]:
         if not self.current_dict_id or not prefix.strip():
             return []
 
-        prefix = prefix.strip().lower()
-        with sqlite3.connect(self.db_path) as conn:
-            words = conn.execute(
-                """
-                SELECT DISTINCT word 
-                FROM entries 
-                WHERE dictionary_id = ? AND LOWER(word) LIKE ?
-                ORDER BY word
-                LIMIT ?
-            """,
-                (self.current_dict_id, f"{prefix}%", limit),
-            ).fetchall()
-            return [w[0] for w in words]
+        low, high = _key_prefix_range(prefix)
+        if not low:
+            return []
+        with self._shared_conn() as conn:
+            # Drive the cursor directly instead of materializing fetchall() rows
+            cursor = conn.execute(
+                _SQL_SUGGEST, (self.current_dict_id, low, high, limit)
+            )
+            return [row[0] for row in cursor]
 
     def get_dictionaries(self) -> List[Tuple[int, str, int]]:
         """Backward compatible: handle missing is_encrypted column"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._shared_conn() as conn:
             try:
-                return conn.execute(
+                rows = conn.execute(
                     "SELECT id, name, word_count FROM dictionaries ORDER BY name"
                 ).fetchall()
             except sqlite3.OperationalError:
                 # Fallback for very old schema
-                return conn.execute(
+                rows = conn.execute(
                     "SELECT id, name, 0 as word_count FROM dictionaries ORDER BY name"
                 ).fetchall()
+        # Remembered so set_active_dictionary can validate ids without a query
+        self._dict_ids = {row[0] for row in rows}
+        return rows
 
     def set_active_dictionary(self, dict_id: int) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
-            exists = conn.execute(
-                "SELECT 1 FROM dictionaries WHERE id = ?", (dict_id,)
-            ).fetchone()
-            if exists:
-                self.current_dict_id = dict_id
-                return True
+        # Read once: an import on another thread may reset it to None
+        ids = self._dict_ids
+        if ids is None:
+            ids = {row[0] for row in self.get_dictionaries()}
+        if dict_id in ids:
+            self.current_dict_id = dict_id
+            return True
+        return False
+
+    @staticmethod
+    def _scan_bgl_files(directory_path: Path) -> Tuple[List[Path], str]:
+        """List the BGL files in a directory (case-insensitive extension).
+
+        Also returns a fingerprint of (name, mtime, size) for every file, used
+        to tell whether the folder changed since the last scan.
+        """
+        # scandir entries carry the file type, so no extra stat for non-BGL
+        files = []
+        stamps = []
+        with os.scandir(directory_path) as it:
+            for f in it:
+                if f.is_file() and os.path.splitext(f.name)[1].lower() == ".bgl":
+                    st = f.stat()
+                    files.append(Path(f.path))
+                    stamps.append((f.name, st.st_mtime_ns, st.st_size))
+        return files, json.dumps(sorted(stamps))
+
+    def scan_is_current(self, directory: str) -> bool:
+        """True if the directory is unchanged since its last completed scan."""
+        directory_path = Path(directory)
+        if not directory_path.is_dir():
             return False
+        _, fingerprint = self._scan_bgl_files(directory_path)
+        with self._shared_conn() as conn:
+            row = conn.execute(
+                "SELECT fingerprint FROM scan_state WHERE directory = ?",
+                (_path_key(directory),),
+            ).fetchone()
+        return row is not None and row[0] == fingerprint
+
+    def _save_scan_fingerprint(self, directory: str, fingerprint: str) -> None:
+        with self._shared_conn() as conn:
+            conn.execute(
+                """INSERT INTO scan_state (directory, fingerprint) VALUES (?, ?)
+                   ON CONFLICT(directory) DO UPDATE SET fingerprint = excluded.fingerprint""",
+                (_path_key(directory), fingerprint),
+            )
 
-    def scan_and_import(self, directory: str) -> List[dict]:
+    def scan_and_import(self, directory: str) -> List[ScanResult]:
         """
         Scans a directory for .bgl files and imports them if not already present.
         Returns a list of results for each file found.
         """
-        results = []
         directory_path = Path(directory)
 
         if not directory_path.exists():
-            return [{"status": "error", "message": f"Directory not found: {directory}"}]
+            return [ScanResult(directory, "error", f"Directory not found: {directory}")]
 
-        # Find all BGL files (case-insensitive)
-        files = []
-        for f in directory_path.iterdir():
-            if f.is_file() and f.suffix.lower() == ".bgl":
-                files.append(f)
+        # Taken before importing, so files changed mid-scan are seen next time
+        files, fingerprint = self._scan_bgl_files(directory_path)
 
-        if not files:
-            return [{"status": "info", "message": "No BGL files found in directory"}]
+        if files:
+            results = self._import_files(files)
+        else:
+            results = [ScanResult(None, "info", "No BGL files found in directory")]
+
+        # Failed files (locked database, unreadable file, ...) must be
+        # retried next time, so only a clean scan counts as current
+        if not any(r.status == "error" for r in results):
+            try:
+                self._save_scan_fingerprint(directory, fingerprint)
+            except sqlite3.OperationalError:
+                pass  # Not recorded; the next start simply scans again
+        return results
 
-        # Get existing dictionary paths to avoid re-importing
-        with sqlite3.connect(self.db_path) as conn:
+    def _import_files(self, files: List[Path]) -> List[ScanResult]:
+        """Import the given BGL files, skipping those already imported."""
+        results = []
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            # Get existing dictionary paths to avoid re-importing
             existing_paths = {
-                row[0]
-                for row in conn.execute(
-                    "SELECT source_path FROM dictionaries"
-                ).fetchall()
+                _path_key(row[0])
+                for row in conn.execute("SELECT source_path FROM dictionaries")
             }
 
-        for file_path in files:
-            abs_path = str(file_path.absolute())
-            file_name = file_path.name
-
-            # Skip if already imported
-            if abs_path in existing_paths:
-                results.append(
-                    {"file": file_name, "status": "skip", "message": "Already imported"}
+            # (file name, abs path, dictionary name) of files to import
+            pending = []
+            for file_path in files:
+                file_name = file_path.name
+
+                # Skip if already imported
+                if _path_key(str(file_path)) in existing_paths:
+                    results.append(ScanResult(file_name, "skip", "Already imported"))
+                    continue
+
+                error, bgl_path, dict_name = self._prepare_bgl(str(file_path))
+                if error:
+                    results.append(ScanResult(file_name, "error", error))
+                    continue
+                pending.append((file_name, bgl_path, dict_name))
+
+            if not pending:
+                return results
+
+            # Dropping the entry indexes and rebuilding them once only pays off
+            # for a batch into an empty table; on a live one it would turn
+            # every search during the scan into a full table scan
+            drop_indexes = False
+            try:
+                # One tuned connection for the whole batch
+                self._apply_bulk_pragmas(conn)
+                if len(pending) > 1 and not conn.execute(
+                    "SELECT 1 FROM entries LIMIT 1"
+                ).fetchone():
+                    drop_indexes = True
+                    self._drop_entry_indexes(conn)
+                self._import_pending(conn, pending, results)
+            except sqlite3.Error as e:
+                # e.g. another import holding the database; report every file
+                # that did not get a result of its own
+                done = {r.file for r in results}
+                msg = f"Import failed: {type(e).__name__}: {str(e)}"
+                results.extend(
+                    ScanResult(file_name, "error", msg)
+                    for file_name, _, _ in pending
+                    if file_name not in done
                 )
-                continue
+            finally:
+                if drop_indexes:
+                    try:
+                        self._create_entry_indexes(conn)
+                    except sqlite3.Error as e:
+                        # _init_db recreates missing indexes on the next start
+                        results.append(
+                            ScanResult(
+                                None,
+                                "error",
+                                f"Could not rebuild search indexes: {str(e)}",
+                            )
+                        )
+
+        return results
 
-            # Attempt import
-            success, msg = self.import_bgl(str(file_path))
+    def _import_pending(
+        self,
+        conn: sqlite3.Connection,
+        pending: List[Tuple[str, str, str]],
+        results: List[ScanResult],
+    ) -> None:
+        """Import (file name, abs path, dictionary name) items, appending results."""
+        if len(pending) == 1:
+            file_name, bgl_path, dict_name = pending[0]
+            try:
+                success, msg = self._import_streaming(conn, bgl_path, dict_name)
+            except Exception as e:
+                success = False
+                msg = f"Import failed: {type(e).__name__}: {str(e)}"
             results.append(
-                {
-                    "file": file_name,
-                    "status": "success" if success else "error",
-                    "message": msg,
-                }
+                ScanResult(file_name, "success" if success else "error", msg)
             )
+            return
 
-        return results
+        # Parse in worker processes; this thread is the single writer.
+        # "spawn": forking from a worker thread of the (multi-threaded) Qt
+        # process can deadlock the child
+        workers = min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = {
+                pool.submit(_parse_bgl, bgl_path): (file_name, bgl_path, dict_name)
+                for file_name, bgl_path, dict_name in pending
+            }
+            for future in as_completed(futures):
+                file_name, bgl_path, dict_name = futures.pop(future)
+                try:
+                    error, rows, counts = future.result()
+                    if error:
+                        success, msg = False, error
+                    else:
+                        success, msg = self._store_entries(
+                            conn, dict_name, bgl_path, iter(rows), counts
+                        )
+                except Exception as e:
+                    success = False
+                    msg = f"Import failed: {type(e).__name__}: {str(e)}"
+                results.append(
+                    ScanResult(file_name, "success" if success else "error", msg)
+                )
 
     # ==================== History Methods ====================
 
-    def add_to_history(self, query: str) -> None:
-        """Add a search query to history."""
+    def add_to_history(self, query: str) -> Optional[str]:
+        """Add a search query to history. Returns the stored timestamp."""
         if not query.strip():
-            return
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO search_history (query, dictionary_id) VALUES (?, ?)",
+            return None
+        with self._shared_conn() as conn:
+            (searched_at,) = conn.execute(
+                """INSERT INTO search_history (query, dictionary_id) VALUES (?, ?)
+                   RETURNING searched_at""",
                 (query.strip(), self.current_dict_id),
-            )
-            # Keep only last 100 entries
+            ).fetchone()
+            # Keep only last 100 entries (ids are AUTOINCREMENT, so newest = largest)
             conn.execute("""
-                DELETE FROM search_history WHERE id NOT IN (
-                    SELECT id FROM search_history ORDER BY searched_at DESC LIMIT 100
-                )
+                DELETE FROM search_history
+                WHERE id <= (SELECT MAX(id) FROM search_history) - 100
             """)
-            conn.commit()
+        return searched_at
 
     def get_history(self, limit: int = 20) -> List[Tuple[str, str]]:
         """Get recent search history. Returns list of (query, timestamp)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._shared_conn() as conn:
             rows = conn.execute(
                 """SELECT query, searched_at FROM search_history 
-                   ORDER BY searched_at DESC LIMIT ?""",
+                   ORDER BY id DESC LIMIT ?""",
                 (limit,),
             ).fetchall()
             return rows
 
     def clear_history(self) -> None:
         """Clear all search history."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._shared_conn() as conn:
             conn.execute("DELETE FROM search_history")
-            conn.commit()
 
     # ==================== Favorites Methods ====================
 
     def add_to_favorites(self, word: str, definition: str) -> bool:
         """Add a word to favorites. Returns True if added, False if already exists."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Check if already favorited
-            exists = conn.execute(
-                "SELECT 1 FROM favorites WHERE word = ? AND dictionary_id = ?",
-                (word, self.current_dict_id),
-            ).fetchone()
-            if exists:
-                return False
-            conn.execute(
-                "INSERT INTO favorites (word, definition, dictionary_id) VALUES (?, ?, ?)",
+        with self._shared_conn() as conn:
+            cursor = conn.execute(
+                """INSERT INTO favorites (word, definition, dictionary_id) VALUES (?, ?, ?)
+                   ON CONFLICT(word, dictionary_id) DO NOTHING""",
                 (word, definition, self.current_dict_id),
             )
-            conn.commit()
-            return True
+            return cursor.rowcount > 0
 
     def remove_from_favorites(self, word: str) -> bool:
         """Remove a word from favorites."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._shared_conn() as conn:
             cursor = conn.execute(
                 "DELETE FROM favorites WHERE word = ? AND dictionary_id = ?",
                 (word, self.current_dict_id),
             )
-            conn.commit()
             return cursor.rowcount > 0
 
     def get_favorites(self, limit: int = 50) -> List[Tuple[str, str, str]]:
         """Get favorites. Returns list of (word, definition, added_at)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._shared_conn() as conn:
             rows = conn.execute(
                 """SELECT word, definition, added_at FROM favorites 
                    ORDER BY added_at DESC LIMIT ?""",
@@ -433,9 +858,22 @@ class DictionaryManager:
             ).fetchall()
             return rows
 
+    def get_favorite_set(self, words: List[str]) -> Set[str]:
+        """Return which of `words` are favorites, in a single query."""
+        if not words:
+            return set()
+        placeholders = ",".join("?" * len(words))
+        with self._shared_conn() as conn:
+            cursor = conn.execute(
+                f"""SELECT word FROM favorites
+                    WHERE dictionary_id = ? AND word IN ({placeholders})""",
+                (self.current_dict_id, *words),
+            )
+            return {row[0] for row in cursor}
+
     def is_favorite(self, word: str) -> bool:
         """Check if a word is in favorites."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._shared_conn() as conn:
             exists = conn.execute(
                 "SELECT 1 FROM favorites WHERE word = ? AND dictionary_id = ?",
                 (word, self.current_dict_id),
@@ -1,6 +1,11 @@
 import sys
+import functools
 import html
+import json
+import multiprocessing
+import sqlite3
 from pathlib import Path
+from typing import Optional
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -10,8 +15,7 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QLabel,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMessageBox,
     QProgressBar,
     QFrame,
@@ -20,73 +24,360 @@ from PyQt6.QtWidgets import (
     QMenu,
     QToolButton,
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QIcon, QAction, QKeySequence, QShortcut
+from PyQt6.QtCore import (
+    Qt,
+    QAbstractListModel,
+    QFileSystemWatcher,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    QThread,
+    QThreadPool,
+    QTimer,
+    QUrl,
+    pyqtSignal,
+    pyqtSlot,
+)
+from PyQt6.QtGui import (
+    QDesktopServices,
+    QFont,
+    QIcon,
+    QAction,
+    QKeySequence,
+    QPainter,
+    QPixmap,
+    QShortcut,
+)
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 
-from dictionary_manager import DictionaryManager
+from dictionary_manager import DictionaryManager, ScanResult
+
+# Folder scanned for BGL files at startup and whenever it changes
+SOURCES_DIR = "sources"
+
+# Local copy of the Vazirmatn web font (CSS plus the files it references).
+# Falls back to the CDN when it has not been bundled.
+ASSETS_DIR = Path(__file__).with_name("assets")
+_FONT_CSS = "fonts/Vazirmatn-font-face.css"
+_FONT_CDN = "https://cdn.jsdelivr.net/npm/vazirmatn@35.0.0/Vazirmatn-font-face.css"
+
+# Application icon, looked up once at import; None when it is not shipped
+_ICON_PATH = Path(__file__).with_name("icon.png")
+_ICON_FILE = str(_ICON_PATH) if _ICON_PATH.exists() else None
+
+
+@functools.lru_cache(maxsize=1)
+def _app_icon() -> Optional[QIcon]:
+    """Build the window icon once (needs a running QApplication)."""
+    return QIcon(_ICON_FILE) if _ICON_FILE is not None else None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_qss() -> str:
+    """Read styles.qss next to this file once per process."""
+    return Path(__file__).with_name("styles.qss").read_text("utf-8")
+
+
+def _emoji_icon(emoji: str, size: int = 32) -> QIcon:
+    """Render an emoji once into an icon that list rows can share."""
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    font = QFont()
+    font.setPixelSize(size * 3 // 4)
+    painter.setFont(font)
+    painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, emoji)
+    painter.end()
+    return QIcon(pixmap)
+
 
+def _nl_to_br(text: str) -> str:
+    """Turn definition line breaks into <br>, dropping Windows-style CRs."""
+    if "\r" in text:
+        text = text.replace("\r", "")
+    return text.replace("\n", "<br>")
 
-class ImportWorker(QThread):
-    """Background worker to import a single BGL file."""
 
+# Result card markup, filled in per search result by _display_results
+_CARD_TMPL = """
+            <div class="card">
+                <div class="word-header">
+                    <span>{word}</span>
+                    <a class="fav-icon" id="fav-{index}" href="wordy:favorite/{index}" title="{fav_title}">{fav_icon}</a>
+                </div>
+                <div class="definition">{definition}</div>
+            </div>
+            """
+
+# Closes the persistent results page; later views only swap #content
+_PAGE_TAIL = """
+        </div>
+        <script>
+            function showContent(markup) {
+                document.getElementById("content").innerHTML = markup;
+                window.scrollTo(0, 0);
+            }
+            function setFavorite(index, on) {
+                var star = document.getElementById("fav-" + index);
+                if (star) {
+                    star.textContent = on ? "\u2605" : "\u2606";
+                    star.title = on ? "Remove from favorites" : "Add to favorites";
+                }
+            }
+        </script>
+        </body></html>
+        """
+
+
+class ImportSignals(QObject):
     finished = pyqtSignal(bool, str)
 
+
+class ImportWorker(QRunnable):
+    """Background task to import a single BGL file."""
+
     def __init__(self, manager: DictionaryManager, bgl_path: str):
         super().__init__()
+        self.signals = ImportSignals()
         self.manager = manager
         self.bgl_path = bgl_path
 
     def run(self):
         success, msg = self.manager.import_bgl(self.bgl_path)
-        self.finished.emit(success, msg)
+        self.signals.finished.emit(success, msg)
 
 
-class ScanWorker(QThread):
-    """Background worker to scan and import dictionaries."""
-
+class ScanSignals(QObject):
     progress = pyqtSignal(str)
     finished = pyqtSignal(list)
 
+
+class ScanWorker(QRunnable):
+    """Background task to scan and import dictionaries."""
+
     def __init__(self, manager: DictionaryManager, source_dir: str):
         super().__init__()
+        self.signals = ScanSignals()
         self.manager = manager
         self.source_dir = source_dir
 
     def run(self):
-        self.progress.emit(f"Scanning '{self.source_dir}' for dictionaries...")
-        results = self.manager.scan_and_import(self.source_dir)
-        self.finished.emit(results)
+        self.signals.progress.emit(f"Scanning '{self.source_dir}' for dictionaries...")
+        try:
+            results = self.manager.scan_and_import(self.source_dir)
+        except Exception as e:
+            # finished must always fire, or the window never leaves scan mode
+            results = [
+                ScanResult(
+                    self.source_dir, "error", f"Scan failed: {type(e).__name__}: {e}"
+                )
+            ]
+        self.signals.finished.emit(results)
 
 
-class SearchWorker(QThread):
-    """Background worker for searching (keeps UI responsive)."""
+class SearchWorker(QObject):
+    """Runs searches on one long-lived thread (keeps UI responsive)."""
 
-    results_ready = pyqtSignal(list)
+    results_ready = pyqtSignal(list, int)
 
-    def __init__(self, manager: DictionaryManager, query: str):
+    def __init__(self, manager: DictionaryManager):
         super().__init__()
         self.manager = manager
-        self.query = query
+        # Set by the GUI thread; searches superseded while queued are skipped
+        self.latest_epoch = 0
 
-    def run(self):
-        results = self.manager.search(self.query, limit=50)
-        self.results_ready.emit(results)
+    @pyqtSlot(str, int)
+    def do_search(self, query: str, epoch: int):
+        if epoch != self.latest_epoch:
+            return
+        results = self.manager.search(query, limit=50)
+        # Build the card markup pieces here rather than on the GUI thread
+        rows = [
+            (entry_id, word, html.escape(word), _nl_to_br(definition))
+            for entry_id, word, definition in results
+        ]
+        self.results_ready.emit(rows, epoch)
+
+
+class _RowListModel(QAbstractListModel):
+    """List model over a plain Python list of rows.
+
+    Only the rows the view actually paints are formatted, and reloading is a
+    single model reset instead of one QListWidgetItem per row.
+    """
+
+    placeholder = None  # Shown as a disabled row while the list is empty
+
+    def __init__(self, icon: QIcon = None, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._icon = icon  # One instance shared by every row
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if not self._rows and self.placeholder:
+            return 1
+        return len(self._rows)
+
+    def flags(self, index):
+        if not self._rows:
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if not self._rows:
+            return self.placeholder if role == Qt.ItemDataRole.DisplayRole else None
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon
+        return self._row_data(self._rows[index.row()], role)
+
+    def _row_data(self, row, role):
+        """Value of `role` for one row; subclasses map their row tuples."""
+        return None
+
+
+class DictListModel(_RowListModel):
+    """Rows of (dict_id, name, word_count)."""
+
+    placeholder = "No dictionaries found"
+
+    def _row_data(self, row, role):
+        dict_id, name, count = row
+        if role == Qt.ItemDataRole.DisplayRole:
+            display_name = name.replace("_", " ").title()
+            return f"{display_name} ({count:,})"
+        if role == Qt.ItemDataRole.UserRole:
+            return dict_id
+        return None
+
+
+class HistoryModel(_RowListModel):
+    """Rows of (query, timestamp), newest first."""
+
+    max_rows = 30
+
+    def prepend(self, query, timestamp):
+        """Insert a new search at the top without reloading the list."""
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._rows.insert(0, (query, timestamp))
+        self.endInsertRows()
+        if len(self._rows) > self.max_rows:
+            last = len(self._rows) - 1
+            self.beginRemoveRows(QModelIndex(), self.max_rows, last)
+            del self._rows[self.max_rows :]
+            self.endRemoveRows()
+
+    def _row_data(self, row, role):
+        query, timestamp = row
+        if role == Qt.ItemDataRole.DisplayRole:
+            return query
+        if role == Qt.ItemDataRole.UserRole:
+            return query
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return timestamp
+        return None
+
+
+class FavoritesModel(_RowListModel):
+    """Rows of (word, definition, added_at)."""
+
+    def _row_data(self, row, role):
+        word, definition, added_at = row
+        if role == Qt.ItemDataRole.DisplayRole:
+            return word
+        if role == Qt.ItemDataRole.UserRole:
+            return (word, definition)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"Added: {added_at}"
+        return None
+
+
+class ResultsPage(QWebEnginePage):
+    """Results page that turns wordy:favorite/<n> star links into a signal.
+
+    The page is loaded once and then updated in place, so it must never be
+    navigated away: other links clicked inside definitions are opened in the
+    system browser (web links) or ignored.
+    """
+
+    favorite_clicked = pyqtSignal(int)
+
+    def acceptNavigationRequest(self, url, nav_type, is_main_frame):
+        if url.scheme() == "wordy":
+            kind, _, index = url.path().partition("/")
+            if kind == "favorite" and index.isdigit():
+                self.favorite_clicked.emit(int(index))
+            return False
+        if is_main_frame and nav_type in (
+            QWebEnginePage.NavigationType.NavigationTypeLinkClicked,
+            QWebEnginePage.NavigationType.NavigationTypeFormSubmitted,
+        ):
+            if url.scheme() in ("http", "https", "mailto"):
+                QDesktopServices.openUrl(url)
+            return False
+        return super().acceptNavigationRequest(url, nav_type, is_main_frame)
 
 
 class ModernDictApp(QMainWindow):
+    search_requested = pyqtSignal(str, int)
+
     def __init__(self):
         super().__init__()
         self.manager = DictionaryManager()
-        self.current_results = []  # Store current results for favorites
+        # Entry ids and words of the shown results, by card index; definitions
+        # are fetched again only when one is added to favorites
+        self.current_result_ids = []
+        self.current_result_words = []
+        # Background tasks reuse pooled threads instead of one QThread each
+        self._pool = QThreadPool.globalInstance()
+        # Searches run one after another on a single persistent thread
+        self._search_thread = QThread(self)
+        self.search_worker = SearchWorker(self.manager)
+        self.search_worker.moveToThread(self._search_thread)
+        self.search_requested.connect(self.search_worker.do_search)
+        self.search_worker.results_ready.connect(self._display_results)
+        self._search_thread.start()
+        # Bumped per search; results from older searches are dropped
+        self._search_epoch = 0
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._search_as_you_type)
+        # Rescan sources/ once file copies into it have settled
+        self._scanning = False
+        self._rescan_pending = False
+        # Dictionary whose results are on screen; list reloads that reselect
+        # it do not re-run the search
+        self._shown_dict_id = None
+        self._warn_box = None
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(1000)
+        self._rescan_timer.timeout.connect(self._on_sources_changed)
+        self._sources_watcher = QFileSystemWatcher(self)
+        if Path(SOURCES_DIR).is_dir():
+            self._sources_watcher.addPath(SOURCES_DIR)
+        self._sources_watcher.directoryChanged.connect(self._rescan_timer.start)
+
+        # The page is loaded once; searches only replace its #content div
+        self._page_ready = False
+        self._pending_content = None
 
         self.setWindowTitle("Wordy - Modern Dictionary")
         self.resize(1200, 800)
 
         # Set App Icon
-        icon_path = Path(__file__).parent / "icon.png"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
+        if _app_icon() is not None:
+            self.setWindowIcon(_app_icon())
 
         # Load Stylesheet
         self._load_stylesheet()
@@ -95,10 +386,14 @@ class ModernDictApp(QMainWindow):
         self._setup_shortcuts()
         self._start_auto_scan()
 
+    def closeEvent(self, event):
+        self._search_thread.quit()
+        self._search_thread.wait()
+        super().closeEvent(event)
+
     def _load_stylesheet(self):
         try:
-            with open("styles.qss", "r") as f:
-                self.setStyleSheet(f.read())
+            self.setStyleSheet(_load_qss())
         except Exception as e:
             print(f"Failed to load stylesheet: {e}")
 
@@ -144,8 +439,10 @@ class ModernDictApp(QMainWindow):
         dict_layout = QVBoxLayout(dict_widget)
         dict_layout.setContentsMargins(0, 0, 0, 0)
 
-        self.dict_list = QListWidget()
-        self.dict_list.currentItemChanged.connect(self._on_dict_selected)
+        self.dict_model = DictListModel(_emoji_icon("📕"), self)
+        self.dict_list = QListView()
+        self.dict_list.setModel(self.dict_model)
+        self.dict_list.selectionModel().currentChanged.connect(self._on_dict_selected)
         dict_layout.addWidget(self.dict_list)
 
         # Import Button
@@ -165,8 +462,10 @@ class ModernDictApp(QMainWindow):
         history_layout = QVBoxLayout(history_widget)
         history_layout.setContentsMargins(0, 0, 0, 0)
 
-        self.history_list = QListWidget()
-        self.history_list.itemDoubleClicked.connect(self._on_history_item_clicked)
+        self.history_model = HistoryModel(_emoji_icon("🔍"), self)
+        self.history_list = QListView()
+        self.history_list.setModel(self.history_model)
+        self.history_list.doubleClicked.connect(self._on_history_item_clicked)
         history_layout.addWidget(self.history_list)
 
         btn_clear_history = QPushButton("🗑️ Clear History")
@@ -183,8 +482,10 @@ class ModernDictApp(QMainWindow):
         favorites_layout = QVBoxLayout(favorites_widget)
         favorites_layout.setContentsMargins(0, 0, 0, 0)
 
-        self.favorites_list = QListWidget()
-        self.favorites_list.itemDoubleClicked.connect(self._on_favorite_item_clicked)
+        self.favorites_model = FavoritesModel(_emoji_icon("⭐"), self)
+        self.favorites_list = QListView()
+        self.favorites_list.setModel(self.favorites_model)
+        self.favorites_list.doubleClicked.connect(self._on_favorite_item_clicked)
         favorites_layout.addWidget(self.favorites_list)
 
         self.sidebar_tabs.addTab(favorites_widget, "⭐ Favorites")
@@ -222,6 +523,7 @@ class ModernDictApp(QMainWindow):
         self.search_input.setMinimumHeight(50)
         self.search_input.setStyleSheet("font-size: 18px;")
         self.search_input.returnPressed.connect(self._perform_search)
+        self.search_input.textChanged.connect(self._search_timer.start)
         search_layout.addWidget(self.search_input)
 
         btn_search = QPushButton("🔍 Search")
@@ -235,7 +537,30 @@ class ModernDictApp(QMainWindow):
 
         # Web View for Results
         self.web_view = QWebEngineView()
-        self.web_view.setHtml(self._get_welcome_html())
+        results_page = ResultsPage(self.web_view)
+        results_page.favorite_clicked.connect(self._toggle_favorite)
+        self.web_view.setPage(results_page)
+        # Cards are static markup; JavaScript stays on for showContent/setFavorite
+        settings = self.web_view.settings()
+        for attr in (
+            QWebEngineSettings.WebAttribute.LocalStorageEnabled,
+            QWebEngineSettings.WebAttribute.WebGLEnabled,
+            QWebEngineSettings.WebAttribute.PluginsEnabled,
+        ):
+            settings.setAttribute(attr, False)
+        self.web_view.loadFinished.connect(self._on_page_loaded)
+        page_html = (
+            self._get_base_html()
+            + '<div id="content">'
+            + self._get_welcome_html()
+            + _PAGE_TAIL
+        )
+        # Explicit base URL so fonts/ resolves against the local assets folder
+        self.web_view.page().setContent(
+            page_html.encode("utf-8"),
+            "text/html;charset=utf-8",
+            QUrl.fromLocalFile(str(ASSETS_DIR) + "/"),
+        )
         content_layout.addWidget(self.web_view)
 
         main_layout.addLayout(content_layout)
@@ -266,170 +591,260 @@ class ModernDictApp(QMainWindow):
         self.status_label.setText(f"⏳ Importing '{Path(path).name}'...")
 
         self.import_worker = ImportWorker(self.manager, path)
-        self.import_worker.finished.connect(self._on_import_finished)
-        self.import_worker.start()
+        self.import_worker.signals.finished.connect(self._on_import_finished)
+        self._pool.start(self.import_worker)
 
     def _on_import_finished(self, success: bool, message: str):
         self.import_btn.setEnabled(True)
         if success:
             QMessageBox.information(self, "✅ Success", message)
-            self._load_dictionaries()
+            # import_bgl makes the new dictionary the active one
+            self._load_dictionaries(select_id=self.manager.current_dict_id)
         else:
             QMessageBox.critical(self, "❌ Import Failed", message)
         self.status_label.setText(
             message[:80] + "..." if len(message) > 80 else message
         )
 
+    def _on_sources_changed(self):
+        if self._scanning:
+            self._rescan_pending = True
+        elif not self.manager.scan_is_current(SOURCES_DIR):
+            self._start_auto_scan()
+
     def _start_auto_scan(self):
+        if self.manager.scan_is_current(SOURCES_DIR):
+            # Nothing added or changed since the last scan
+            self._load_dictionaries()
+            self._load_history()
+            self._load_favorites()
+            return
+
+        self._scanning = True
         self.scan_progress.show()
         self.scan_progress.setRange(0, 0)
-        self.scan_worker = ScanWorker(self.manager, "sources")
-        self.scan_worker.progress.connect(self.status_label.setText)
-        self.scan_worker.finished.connect(self._on_scan_finished)
-        self.scan_worker.start()
+        self.scan_worker = ScanWorker(self.manager, SOURCES_DIR)
+        self.scan_worker.signals.progress.connect(self.status_label.setText)
+        self.scan_worker.signals.finished.connect(self._on_scan_finished)
+        self._pool.start(self.scan_worker)
 
     def _on_scan_finished(self, results):
+        self._scanning = False
+        if self._rescan_pending:
+            self._rescan_pending = False
+            self._rescan_timer.start()
         self.scan_progress.hide()
-        import_count = sum(1 for r in results if r["status"] == "success")
+        import_count = 0
+        errors = []
+        for r in results:
+            if r.status == "success":
+                import_count += 1
+            elif r.status == "error":
+                errors.append(r)
         self.status_label.setText(f"Scan complete. {import_count} imported.")
         self._load_dictionaries()
         self._load_history()
         self._load_favorites()
 
-        errors = [r for r in results if r["status"] == "error"]
         if errors:
-            msg = "\n".join([f"• {e['file']}: {e['message'][:50]}..." for e in errors])
-            QMessageBox.warning(
-                self, "Import Issues", f"Some files could not be imported:\n\n{msg}"
+            msg = "\n".join([f"• {e.file}: {e.message[:50]}..." for e in errors])
+            # Non-modal so the freshly loaded lists stay usable; the reference
+            # keeps the box alive (and a later rescan replaces it)
+            if self._warn_box is not None:
+                self._warn_box.close()
+            self._warn_box = QMessageBox(
+                QMessageBox.Icon.Warning,
+                "Import Issues",
+                f"Some files could not be imported:\n\n{msg}",
+                QMessageBox.StandardButton.Ok,
+                self,
             )
+            self._warn_box.setModal(False)
+            self._warn_box.show()
 
-    def _load_dictionaries(self):
-        self.dict_list.clear()
+    def _load_dictionaries(self, select_id=None):
+        """Reload the list, keeping the selected dictionary (or `select_id`)."""
+        if select_id is None:
+            select_id = self.dict_list.currentIndex().data(Qt.ItemDataRole.UserRole)
         dicts = self.manager.get_dictionaries()
+        self.dict_model.set_rows(dicts)
 
-        if not dicts:
-            item = QListWidgetItem("No dictionaries found")
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            self.dict_list.addItem(item)
-            return
-
-        for dict_id, name, count in dicts:
-            display_name = name.replace("_", " ").title()
-            item = QListWidgetItem(f"📕 {display_name} ({count:,})")
-            item.setData(Qt.ItemDataRole.UserRole, dict_id)
-            self.dict_list.addItem(item)
-
-        if self.dict_list.count() > 0:
-            self.dict_list.setCurrentRow(0)
+        if dicts:
+            row = next((i for i, d in enumerate(dicts) if d[0] == select_id), 0)
+            self.dict_list.setCurrentIndex(self.dict_model.index(row))
 
     def _load_history(self):
-        self.history_list.clear()
-        history = self.manager.get_history(limit=30)
-        for query, timestamp in history:
-            item = QListWidgetItem(f"🔍 {query}")
-            item.setData(Qt.ItemDataRole.UserRole, query)
-            item.setToolTip(timestamp)
-            self.history_list.addItem(item)
+        self.history_model.set_rows(
+            self.manager.get_history(limit=self.history_model.max_rows)
+        )
 
     def _load_favorites(self):
-        self.favorites_list.clear()
-        favorites = self.manager.get_favorites(limit=50)
-        for word, definition, added_at in favorites:
-            item = QListWidgetItem(f"⭐ {word}")
-            item.setData(Qt.ItemDataRole.UserRole, (word, definition))
-            item.setToolTip(f"Added: {added_at}")
-            self.favorites_list.addItem(item)
-
-    def _on_dict_selected(self, current: QListWidgetItem, previous: QListWidgetItem):
-        if not current:
+        self.favorites_model.set_rows(self.manager.get_favorites(limit=50))
+
+    def _on_dict_selected(self, current: QModelIndex, previous: QModelIndex):
+        if not current.isValid():
             return
         dict_id = current.data(Qt.ItemDataRole.UserRole)
-        if dict_id:
+        if dict_id and dict_id != self._shown_dict_id:
+            self._shown_dict_id = dict_id
             self.manager.set_active_dictionary(dict_id)
             self.search_input.setFocus()
             if self.search_input.text():
                 self._perform_search()
 
-    def _on_history_item_clicked(self, item: QListWidgetItem):
+    def _on_history_item_clicked(self, item: QModelIndex):
         query = item.data(Qt.ItemDataRole.UserRole)
         if query:
             self.search_input.setText(query)
             self._perform_search()
 
-    def _on_favorite_item_clicked(self, item: QListWidgetItem):
+    def _on_favorite_item_clicked(self, item: QModelIndex):
         data = item.data(Qt.ItemDataRole.UserRole)
         if data:
             word, definition = data
             self._display_single_result(word, definition)
 
     def _clear_history(self):
-        self.manager.clear_history()
+        try:
+            self.manager.clear_history()
+        except sqlite3.OperationalError as e:
+            self.status_label.setText(f"Could not clear history: {e}")
+            return
         self._load_history()
         self.status_label.setText("History cleared")
 
     def _perform_search(self):
+        self._search_timer.stop()
         query = self.search_input.text().strip()
         if not query:
             return
 
-        # Add to history
-        self.manager.add_to_history(query)
-        self._load_history()
+        # Add to history; a busy database (e.g. during an import) only costs
+        # the history entry, not the search
+        try:
+            searched_at = self.manager.add_to_history(query)
+        except sqlite3.OperationalError:
+            searched_at = None
+        if searched_at:
+            self.history_model.prepend(query, searched_at)
 
+        self._start_search(query)
+
+    def _search_as_you_type(self):
+        query = self.search_input.text().strip()
+        if query:
+            self._start_search(query)
+
+    def _start_search(self, query: str):
+        self._search_epoch += 1
         self.status_label.setText(f"Searching for '{query}'...")
 
-        self.search_worker = SearchWorker(self.manager, query)
-        self.search_worker.results_ready.connect(self._display_results)
-        self.search_worker.start()
+        self.search_worker.latest_epoch = self._search_epoch
+        self.search_requested.emit(query, self._search_epoch)
 
-    def _display_results(self, results):
+    def _display_results(self, results, epoch):
+        """Show (entry id, word, escaped word, definition HTML) rows from SearchWorker."""
+        if epoch != self._search_epoch:
+            return  # A newer search has been started since
         self.status_label.setText("Ready")
         query = self.search_input.text().strip()
-        self.current_results = results
+        self.current_result_ids = [row[0] for row in results]
+        self.current_result_words = [row[1] for row in results]
 
         if not results:
-            self.web_view.setHtml(self._get_no_results_html(query))
+            self._show_content(self._get_no_results_html(query))
             return
 
-        html_content = self._get_base_html()
-        html_content += '<div class="results-container">'
+        parts = ['<div class="results-container">']
+
+        # One query for the favorite state of every result
+        fav_set = self.manager.get_favorite_set(self.current_result_words)
+
+        for index, (_, word, word_html, definition_html) in enumerate(results):
+            is_fav = word in fav_set
+            parts.append(
+                _CARD_TMPL.format(
+                    index=index,
+                    word=word_html,
+                    fav_title="Remove from favorites" if is_fav else "Add to favorites",
+                    fav_icon="★" if is_fav else "☆",
+                    definition=definition_html,
+                )
+            )
 
-        for word, definition in results:
-            is_fav = self.manager.is_favorite(word)
-            fav_icon = "★" if is_fav else "☆"
-            formatted_def = definition.replace("\n", "<br>")
+        parts.append("</div>")
+        self._show_content("".join(parts))
 
-            html_content += f"""
-            <div class="card">
-                <div class="word-header">
-                    <span>{html.escape(word)}</span>
-                    <span class="fav-icon" title="{"Remove from favorites" if is_fav else "Add to favorites"}">{fav_icon}</span>
-                </div>
-                <div class="definition">{formatted_def}</div>
-            </div>
-            """
+    def _toggle_favorite(self, index: int):
+        """Star or unstar the result card at `index`."""
+        if not 0 <= index < len(self.current_result_words):
+            return
+        word = self.current_result_words[index]
+        try:
+            if self.manager.is_favorite(word):
+                self.manager.remove_from_favorites(word)
+                is_fav = False
+            else:
+                definition = self.manager.get_definition(
+                    self.current_result_ids[index]
+                )
+                if definition is None:
+                    return  # Dictionary changed since the results were shown
+                self.manager.add_to_favorites(word, definition)
+                is_fav = True
+        except sqlite3.OperationalError as e:
+            self.status_label.setText(f"Could not update favorites: {e}")
+            return
 
-        html_content += "</div></body></html>"
-        self.web_view.setHtml(html_content)
+        # Favorites are per headword, so every card of this word changes
+        state = "true" if is_fav else "false"
+        self.web_view.page().runJavaScript(
+            "".join(
+                f"setFavorite({i}, {state});"
+                for i, w in enumerate(self.current_result_words)
+                if w == word
+            )
+        )
+        self._load_favorites()
+        self.status_label.setText(
+            f"Added '{word}' to favorites" if is_fav else f"Removed '{word}' from favorites"
+        )
 
     def _display_single_result(self, word: str, definition: str):
-        html_content = self._get_base_html()
-        formatted_def = definition.replace("\n", "<br>")
-        html_content += f"""
+        self.current_result_ids = []
+        self.current_result_words = []
+        formatted_def = _nl_to_br(definition)
+        self._show_content(
+            f"""
         <div class="card">
             <div class="word-header">{html.escape(word)}</div>
             <div class="definition">{formatted_def}</div>
         </div>
-        </body></html>
         """
-        self.web_view.setHtml(html_content)
+        )
+
+    def _show_content(self, markup: str):
+        """Replace the results area in place instead of reloading the page."""
+        if not self._page_ready:
+            self._pending_content = markup
+            return
+        self.web_view.page().runJavaScript(f"showContent({json.dumps(markup)})")
+
+    def _on_page_loaded(self, ok: bool):
+        self._page_ready = ok
+        if ok and self._pending_content is not None:
+            markup, self._pending_content = self._pending_content, None
+            self._show_content(markup)
 
     def _get_base_html(self):
-        return """
+        font_css = _FONT_CSS if (ASSETS_DIR / _FONT_CSS).is_file() else _FONT_CDN
+        return (
+            f"""
         <!DOCTYPE html>
         <html>
         <head>
-            <link href="https://cdn.jsdelivr.net/npm/vazirmatn@35.0.0/Vazirmatn-font-face.css" rel="stylesheet">
+            <link href="{font_css}" rel="stylesheet">"""
+            + """
             <style>
                 body {
                     background-color: #1e1e1e;
@@ -482,12 +897,10 @@ class ModernDictApp(QMainWindow):
         </head>
         <body>
         """
+        )
 
     def _get_welcome_html(self):
-        base = self._get_base_html()
-        return (
-            base
-            + """
+        return """
             <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 80vh; color: #777;">
                 <h1 style="font-size: 56px; margin-bottom: 10px; color: #4ec9b0;">📖 WORDY</h1>
                 <p style="font-size: 20px; color: #888;">Type a word above to start searching</p>
@@ -501,32 +914,24 @@ class ModernDictApp(QMainWindow):
                     </ul>
                 </div>
             </div>
-        </body></html>
         """
-        )
 
     def _get_no_results_html(self, query):
-        base = self._get_base_html()
-        return (
-            base
-            + f"""
+        return f"""
             <div style="text-align: center; padding-top: 60px;">
                 <h2 style="color: #f44747; font-size: 28px;">No results found</h2>
                 <p style="font-size: 18px;">We couldn't find any matches for "<strong>{html.escape(query)}</strong>"</p>
                 <p style="color: #666; font-size: 14px;">Try checking the spelling or switching dictionaries.</p>
             </div>
-        </body></html>
         """
-        )
 
 
 def main():
     app = QApplication(sys.argv)
 
     # Set app icon globally
-    icon_path = Path(__file__).parent / "icon.png"
-    if icon_path.exists():
-        app.setWindowIcon(QIcon(str(icon_path)))
+    if _app_icon() is not None:
+        app.setWindowIcon(_app_icon())
 
     window = ModernDictApp()
     window.show()
@@ -534,4 +939,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Dictionary scans parse BGL files in worker processes (needed when frozen)
+    multiprocessing.freeze_support()
     main()